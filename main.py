@@ -6,6 +6,7 @@ This script demonstrates how to use the hierarchical agent system
 for complex tasks requiring both research and writing capabilities.
 """
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -15,7 +16,7 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 from hierarchical_agents import HierarchicalSystem, Config
 
 
-def main():
+async def main():
     """Main function demonstrating the hierarchical agent system."""
     print("🤖 Initializing Hierarchical AI Agents System...")
     
@@ -33,10 +34,11 @@ def main():
         user_input = "Research AI agents and write a brief report about them."
         
         # Run the system and stream results
-        for step in system.run(user_input):
+        async for step in system.run(user_input):
             print(f"📝 Step: {step}")
             print("-" * 40)
         
+        await system.aclose()
         print("\n✅ Task completed successfully!")
         
     except ValueError as e:
@@ -52,7 +54,7 @@ def main():
     return 0
 
 
-def demo_individual_teams():
+async def demo_individual_teams():
     """Demonstrate individual team capabilities."""
     print("\n" + "="*60)
     print("🧪 Team Capability Demonstration")
@@ -64,11 +66,11 @@ def demo_individual_teams():
         
         # Test research team
         print("🔍 Testing Research Team:")
-        research_result = system.research_team.invoke([("user", "What is machine learning?")])
+        research_result = await system.research_team.ainvoke([("user", "What is machine learning?")])
         print(f"Research result: {research_result['messages'][-1].content[:200]}...")
         
         print("\n📝 Testing Writing Team:")
-        writing_result = system.writing_team.invoke([("user", "Create an outline for an AI report")])
+        writing_result = await system.writing_team.ainvoke([("user", "Create an outline for an AI report")])
         print(f"Writing result: {writing_result['messages'][-1].content[:200]}...")
         
     except Exception as e:
@@ -76,9 +78,9 @@ def demo_individual_teams():
 
 
 if __name__ == "__main__":
-    exit_code = main()
+    exit_code = asyncio.run(main())
     
     # Uncomment to run team demos
-    # demo_individual_teams()
+    # asyncio.run(demo_individual_teams())
     
     sys.exit(exit_code)
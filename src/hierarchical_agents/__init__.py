@@ -5,14 +5,28 @@ A sophisticated multi-tier agent system using LangGraph for coordinating
 research, writing, and visualization tasks.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 __author__ = "Hierarchical Agents Project"
 
-from .config import Config
-from .supervisor import SupervisorFramework
-from .research_team import ResearchTeam
-from .writing_team import WritingTeam
-from .hierarchical_system import HierarchicalSystem
+if TYPE_CHECKING:
+    from .config import Config
+    from .supervisor import SupervisorFramework
+    from .research_team import ResearchTeam
+    from .writing_team import WritingTeam
+    from .hierarchical_system import HierarchicalSystem
+
+# Public names and the submodules defining them; imported on first access (PEP 562)
+# so importing the package doesn't pull in LangChain until it is needed
+_LAZY_IMPORTS = {
+    "Config": ".config",
+    "SupervisorFramework": ".supervisor",
+    "ResearchTeam": ".research_team",
+    "WritingTeam": ".writing_team",
+    "HierarchicalSystem": ".hierarchical_system",
+}
 
 __all__ = [
     "Config",
@@ -21,3 +35,17 @@ __all__ = [
     "WritingTeam",
     "HierarchicalSystem",
 ]
+
+
+def __getattr__(name):
+    """Import public classes lazily on first attribute access."""
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List lazily imported names alongside the module's globals."""
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
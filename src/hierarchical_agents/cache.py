@@ -0,0 +1,123 @@
+"""
+Caching utilities for avoiding repeated LLM calls in the agent system.
+"""
+
+import json
+import math
+import re
+from collections import Counter, OrderedDict
+from hashlib import blake2b, sha256
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.messages import BaseMessage
+from langgraph.cache.base import BaseCache
+from langgraph.types import CachePolicy
+
+
+def extend_prefix_hashes(hashes: Sequence[bytes], messages: Sequence[BaseMessage]) -> List[bytes]:
+    """Compute rolling hashes for the messages not yet covered by `hashes`.
+
+    The i-th hash is `blake2b(h[i-1] + message_i)`, so each entry identifies the
+    whole conversation prefix ending at that message.
+    """
+    current = hashes[-1] if hashes else b""
+    extended = []
+    for message in messages[len(hashes):]:
+        payload = json.dumps((message.type, message.name, message.content), default=str)
+        current = blake2b(current + payload.encode(), digest_size=16).digest()
+        extended.append(current)
+    return extended
+
+
+class RoutingCache:
+    """LRU cache mapping conversation prefix hashes to supervisor routing decisions."""
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize the cache with a maximum size."""
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+
+    def get(self, key: bytes) -> Optional[str]:
+        """Return the cached routing decision for a key, if any."""
+        goto = self._entries.get(key)
+        if goto is not None:
+            self._entries.move_to_end(key)
+        return goto
+
+    def put(self, key: bytes, goto: str) -> None:
+        """Store a routing decision, evicting the least recently used entry when full."""
+        self._entries[key] = goto
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class PlanTemplateCache:
+    """Cache of supervisor routing sequences keyed by the shape of the user request.
+
+    Requests are embedded as bag-of-words vectors; a new request whose cosine
+    similarity to a stored one exceeds `threshold` reuses that request's plan.
+    """
+
+    def __init__(self, maxsize: int = 128, threshold: float = 0.9):
+        """Initialize the cache with a maximum size and a similarity threshold."""
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self._entries: "OrderedDict[str, Tuple[Dict[str, float], List[str]]]" = OrderedDict()
+
+    @staticmethod
+    def embed(text: str) -> Dict[str, float]:
+        """Embed text as an L2-normalised term-frequency vector."""
+        counts = Counter(re.findall(r"\w+", text.lower()))
+        norm = math.sqrt(sum(count * count for count in counts.values()))
+        return {term: count / norm for term, count in counts.items()} if norm else {}
+
+    @staticmethod
+    def similarity(a: Dict[str, float], b: Dict[str, float]) -> float:
+        """Cosine similarity between two normalised vectors."""
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+    def get(self, user_input: str) -> Optional[List[str]]:
+        """Return the plan of the most similar stored request, if similar enough."""
+        if user_input in self._entries:
+            self._entries.move_to_end(user_input)
+            return list(self._entries[user_input][1])
+        
+        vector = self.embed(user_input)
+        best_key, best_score = None, self.threshold
+        for key, (stored, _) in self._entries.items():
+            score = self.similarity(vector, stored)
+            if score >= best_score:
+                best_key, best_score = key, score
+        if best_key is None:
+            return None
+        self._entries.move_to_end(best_key)
+        return list(self._entries[best_key][1])
+
+    def put(self, user_input: str, plan: List[str]) -> None:
+        """Store the routing sequence observed for a request."""
+        self._entries[user_input] = (self.embed(user_input), list(plan))
+        self._entries.move_to_end(user_input)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _last_message_key(state) -> str:
+    """Hash the content of the last message in a node's input state."""
+    return sha256(str(state["messages"][-1].content).encode()).hexdigest()
+
+
+def last_message_cache_policy(ttl: Optional[int] = 3600) -> CachePolicy:
+    """Node cache policy keyed on the content of the last input message."""
+    return CachePolicy(key_func=_last_message_key, ttl=ttl)
+
+
+def create_node_cache(path: Optional[str] = None) -> BaseCache:
+    """Create a LangGraph node cache, persisted to SQLite when a path is given."""
+    if path:
+        from langgraph.cache.sqlite import SqliteCache
+        return SqliteCache(path=path)
+    from langgraph.cache.memory import InMemoryCache
+    return InMemoryCache()
@@ -4,7 +4,6 @@ Configuration management for the Hierarchical Agents system.
 
 import os
 from typing import Optional
-from pydantic import SecretStr
 from dotenv import load_dotenv
 
 
@@ -15,32 +14,45 @@ class Config:
         """Initialize configuration by loading environment variables."""
         load_dotenv()
         
-        # API Keys
-        self.openai_api_key = SecretStr(os.getenv("OPENAI_API_KEY", ""))
-        self.tavily_api_key = SecretStr(os.getenv("TAVILY_API_KEY", ""))
-        self.groq_api_key = SecretStr(os.getenv("GROQ_API_KEY", ""))
+        # API Keys, resolved once and stored as plain strings; SecretStr masking was
+        # dropped on purpose, so vars(config) and config.__dict__ show them in full
+        self._openai_key: str = os.getenv("OPENAI_API_KEY", "")
+        self._tavily_key: str = os.getenv("TAVILY_API_KEY", "")
+        self._groq_key: str = os.getenv("GROQ_API_KEY", "")
         
         # Environment settings
         os.environ["USER_AGENT"] = "HierarchicalAgents/1.0"
         
         # Model configuration
         self.default_model = "llama-3.3-70b-versatile"
+        self.router_model = "llama-3.1-8b-instant"
         self.temperature = 0
         self.recursion_limit = 150
+        self.supervisor_max_history = 20
+        self.fast_routing = True
+        self.speculative_dispatch = True
+        
+        # Shared HTTP connection pool for LLM calls
+        self.http_max_connections = 64
+        self.http_max_keepalive_connections = 32
+        self.http_timeout = 60
+        
+        # Node result cache; persisted to SQLite when NODE_CACHE_PATH is set
+        self.node_cache_path = os.getenv("NODE_CACHE_PATH")
+        self.node_cache_ttl = 3600
         
     def validate(self) -> bool:
         """Validate that required API keys are available."""
-        required_keys = [self.groq_api_key, self.tavily_api_key]
-        return all(key.get_secret_value() for key in required_keys)
+        return bool(self._groq_key and self._tavily_key)
     
     def get_openai_key(self) -> Optional[str]:
         """Get OpenAI API key if available."""
-        return self.openai_api_key.get_secret_value() if self.openai_api_key.get_secret_value() else None
+        return self._openai_key or None
     
     def get_groq_key(self) -> Optional[str]:
         """Get Groq API key if available."""
-        return self.groq_api_key.get_secret_value() if self.groq_api_key.get_secret_value() else None
+        return self._groq_key or None
     
     def get_tavily_key(self) -> Optional[str]:
         """Get Tavily API key if available."""
-        return self.tavily_api_key.get_secret_value() if self.tavily_api_key.get_secret_value() else None
+        return self._tavily_key or None
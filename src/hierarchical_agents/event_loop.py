@@ -0,0 +1,88 @@
+"""
+Event loop helpers: the background loop backing the synchronous entry points
+and an HTTP transport that is safe to share between loops.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Coroutine, Optional
+
+import httpx
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background loop, starting its thread on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="hierarchical-agents-loop", daemon=True
+            ).start()
+    return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine to completion on the persistent background loop.
+
+    Every synchronous call shares one loop, so async HTTP clients and their
+    keep-alive connections stay bound to a loop that is still running.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError(
+            "Synchronous invoke/run_sync cannot be called from a running event loop "
+            "(e.g. Jupyter); await ainvoke() or iterate run() instead."
+        )
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+class PerLoopTransport(httpx.AsyncBaseTransport):
+    """Async transport keeping a separate connection pool for each event loop.
+
+    httpx connection pools are bound to the loop that first uses them, so one
+    `AsyncClient` shared by the background loop and callers' own loops would
+    fail with "bound to a different event loop". Pools of loops that have been
+    garbage collected are dropped with them.
+    """
+
+    def __init__(self, **transport_kwargs: Any):
+        """Initialize with the arguments for each loop's `AsyncHTTPTransport`."""
+        self._transport_kwargs = transport_kwargs
+        self._transports: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _transport(self) -> httpx.AsyncHTTPTransport:
+        """Return the running loop's transport, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        """Send the request through the running loop's connection pool."""
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Close every pool on the loop that owns it; pools of stopped loops are discarded."""
+        current = asyncio.get_running_loop()
+        with self._lock:
+            transports = list(self._transports.items())
+            self._transports.clear()
+        for loop, transport in transports:
+            if loop is current:
+                await transport.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(transport.aclose(), loop))
@@ -2,12 +2,22 @@
 Complete hierarchical system that coordinates research and writing teams.
 """
 
-from typing import Literal
+import asyncio
+import contextvars
+import hashlib
+import threading
+import httpx
+from typing import Any, Dict, List, Literal, NamedTuple, Optional
 from langchain_core.messages import HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
-from langgraph.graph import StateGraph, START
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
+from langgraph.graph import StateGraph, START, END
 from langgraph.types import Command
 
+from .event_loop import PerLoopTransport, run_sync
+from .cache import PlanTemplateCache, create_node_cache, last_message_cache_policy
+from .speculation import BigramPredictor
 from .supervisor import State, SupervisorFramework
 from .research_team import ResearchTeam
 from .writing_team import WritingTeam
@@ -15,9 +25,137 @@ from .tools import ToolsManager
 from .config import Config
 
 
+class _Settings(NamedTuple):
+    """Hashable snapshot of the settings that shape the shared components.
+    
+    API keys are represented by a digest so the snapshot, used as a registry
+    key, never shows them in reprs or tracebacks.
+    """
+    default_model: str
+    router_model: str
+    temperature: float
+    keys_digest: str
+    http_max_connections: int
+    http_max_keepalive_connections: int
+    http_timeout: float
+    node_cache_path: Optional[str]
+    node_cache_ttl: Optional[int]
+    
+    @classmethod
+    def from_config(cls, config: Config) -> "_Settings":
+        """Capture the relevant settings of a config."""
+        return cls(
+            config.default_model,
+            config.router_model,
+            config.temperature,
+            hashlib.sha256(
+                "\0".join([config.get_groq_key() or "", config.get_tavily_key() or ""]).encode()
+            ).hexdigest(),
+            config.http_max_connections,
+            config.http_max_keepalive_connections,
+            config.http_timeout,
+            config.node_cache_path,
+            config.node_cache_ttl,
+        )
+
+
+class _Components(NamedTuple):
+    """Stateless pieces shared by systems built from the same settings."""
+    http_client: httpx.Client
+    http_async_client: httpx.AsyncClient
+    llm: BaseChatModel
+    router_llm: BaseChatModel
+    cache: Any
+    research_team: ResearchTeam
+
+
+def _build_components(settings: _Settings, groq_key: str, tavily_key: str) -> _Components:
+    """Build the LLMs, node cache and compiled research graph for a set of settings.
+    
+    None of these hold per-system state, so systems with the same settings
+    share them instead of rebuilding them on construction.
+    """
+    # Shared keep-alive HTTP/2 clients so LLM calls reuse warm connections
+    limits = httpx.Limits(
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        max_connections=settings.http_max_connections,
+    )
+    http_client = httpx.Client(http2=True, limits=limits, timeout=settings.http_timeout)
+    # The async pool is kept per event loop, since sync and async entry points run on different loops
+    http_async_client = httpx.AsyncClient(
+        transport=PerLoopTransport(http2=True, limits=limits), timeout=settings.http_timeout
+    )
+    
+    # Initialize LLMs; supervisors only pick the next worker, so they use a
+    # smaller, faster model
+    from langchain_groq import ChatGroq
+    llm = ChatGroq(
+        model=settings.default_model, 
+        temperature=settings.temperature, 
+        api_key=groq_key,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+    router_llm = ChatGroq(
+        model=settings.router_model,
+        temperature=settings.temperature,
+        api_key=groq_key,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+    
+    # Shared node result cache
+    cache = create_node_cache(settings.node_cache_path)
+    
+    # The research team only searches and scrapes, so its tools hold no
+    # documents and never run the sandbox
+    research_team = ResearchTeam(
+        llm,
+        ToolsManager(tavily_key),
+        cache=cache,
+        cache_ttl=settings.node_cache_ttl,
+        router_llm=router_llm,
+    )
+    
+    return _Components(http_client, http_async_client, llm, router_llm, cache, research_team)
+
+
+# Shared components by settings, with the number of open systems using them
+_shared_components: Dict[_Settings, List[Any]] = {}
+_shared_lock = threading.Lock()
+
+
+def _acquire_components(settings: _Settings, groq_key: str, tavily_key: str) -> _Components:
+    """Return the shared components for a set of settings, building them if needed."""
+    with _shared_lock:
+        entry = _shared_components.get(settings)
+        if entry is None:
+            components = _build_components(settings, groq_key, tavily_key)
+            entry = _shared_components[settings] = [components, 0]
+        entry[1] += 1
+        return entry[0]
+
+
+def _release_components(settings: _Settings) -> Optional[_Components]:
+    """Release one system's use of the shared components.
+    
+    Returns the components once no open system uses them, so the caller can
+    close them; otherwise returns None.
+    """
+    with _shared_lock:
+        entry = _shared_components[settings]
+        entry[1] -= 1
+        if entry[1] > 0:
+            return None
+        del _shared_components[settings]
+        return entry[0]
+
+
 class HierarchicalSystem:
     """Complete hierarchical agent system coordinating research and writing teams."""
     
+    teams = ["research_team", "writer_team"]
+    
     def __init__(self, config: Config = None):
         """Initialize the complete hierarchical system."""
         if config is None:
@@ -29,42 +167,189 @@ class HierarchicalSystem:
         if not config.validate():
             raise ValueError("Missing required API keys. Please check your .env file.")
         
-        # Initialize LLM
-        from langchain_groq import ChatGroq
-        self.llm = ChatGroq(
-            model=config.default_model, 
-            temperature=config.temperature, 
-            api_key=config.get_groq_key()
-        )
+        # LLMs and the research graph are shared by systems with identical settings
+        self._settings = _Settings.from_config(config)
+        self._closed = False
+        (
+            self.http_client,
+            self.http_async_client,
+            self.llm,
+            self.router_llm,
+            self.cache,
+            self.research_team,
+        ) = _acquire_components(self._settings, config.get_groq_key(), config.get_tavily_key())
         
-        # Initialize tools manager
+        # Documents and the Python sandbox belong to this system alone
         self.tools_manager = ToolsManager(config.get_tavily_key())
-        
-        # Initialize teams
-        self.research_team = ResearchTeam(self.llm, self.tools_manager)
-        self.writing_team = WritingTeam(self.llm, self.tools_manager)
+        self.writing_team = WritingTeam(self.llm, self.tools_manager, router_llm=self.router_llm)
         
         # Create super supervisor
         self.supervisor_node = SupervisorFramework.make_supervisor_node(
-            self.llm, ["research_team", "writer_team"]
+            self.router_llm,
+            self.teams,
+            max_history=config.supervisor_max_history,
+            fast_router=self._fast_route if config.fast_routing else None,
         )
         
+        # Routing sequences of completed runs, replayed for similar requests
+        self.plan_cache = PlanTemplateCache()
+        
+        # Predicts the next team so it can be started speculatively
+        self.predictor = BigramPredictor()
+        
         # Build the complete system graph
         self.graph = self._build_graph()
     
     def _build_graph(self):
         """Build the complete hierarchical system graph."""
         builder = StateGraph(State)
-        builder.add_node("supervisor", self.supervisor_node)
-        builder.add_node("research_team", self._call_research_team)
+        builder.add_node("supervisor", self._supervisor)
+        builder.add_node(
+            "research_team",
+            self._call_research_team,
+            cache_policy=last_message_cache_policy(self.config.node_cache_ttl),
+        )
         builder.add_node("writer_team", self._call_writer_team)
         
         builder.add_edge(START, "supervisor")
-        return builder.compile()
+        return builder.compile(cache=self.cache)
     
-    def _call_research_team(self, state: State) -> Command[Literal["supervisor"]]:
+    async def _supervisor(self, state: State, config: RunnableConfig) -> Command[Any]:
+        """Replay a cached plan template if one applies, otherwise ask the LLM supervisor.
+        
+        While the supervisor is deciding, the team predicted from past runs is
+        started speculatively; its run is parked for the team node if the
+        supervisor agrees and cancelled otherwise.
+        """
+        messages = state["messages"]
+        plan = config.get("configurable", {}).get("plan_template")
+        parked = config.get("configurable", {}).get("speculative")
+        trajectory = self._trajectory(messages)
+        if plan and len(trajectory) < len(plan):
+            goto = plan[len(trajectory)]
+            return Command(goto=goto, update={"next": goto})
+        
+        # Drop a speculative run for the previous step the node cache made unnecessary
+        if parked and len(messages) > 1:
+            stale = parked.pop(messages[-2].id, None)
+            if stale is not None:
+                stale.cancel()
+        
+        # Only the research team is side-effect free, so only it is safe to start early
+        task = None
+        predicted = self.predictor.predict(trajectory[-1] if trajectory else START)
+        if (
+            parked is not None
+            and self.config.speculative_dispatch
+            and predicted == "research_team"
+            and not config.get("configurable", {}).get("stream_tokens")
+        ):
+            # Detached from the supervisor's context, so carry over the run's limits and callbacks
+            task = asyncio.get_running_loop().create_task(
+                self.research_team.ainvoke(
+                    messages[-1:],
+                    {
+                        "recursion_limit": config.get("recursion_limit", self.config.recursion_limit),
+                        "callbacks": config.get("callbacks"),
+                    },
+                ),
+                context=contextvars.Context(),
+            )
+        
+        try:
+            command = await self.supervisor_node(state)
+        except BaseException:
+            if task is not None:
+                task.cancel()
+            raise
+        
+        if task is not None:
+            if command.goto == predicted:
+                parked[messages[-1].id] = task
+            else:
+                task.cancel()
+        return command
+    
+    def _fast_route(self, state: State) -> Optional[str]:
+        """Route deterministically when the research-then-write plan makes the next step obvious."""
+        messages = state["messages"]
+        trajectory = self._trajectory(messages)
+        if trajectory[-1:] == ["writer_team"] and "research_team" in trajectory:
+            return "FINISH"
+        if not trajectory and "research" in str(messages[0].content).lower():
+            return "research_team"
+        return None
+    
+    def _trajectory(self, messages) -> List[str]:
+        """Extract the sequence of teams that have reported back so far."""
+        return [message.name for message in messages if message.name in self.teams]
+    
+    def _run_config(
+        self, user_input: str, recursion_limit: int = None, stream_tokens: bool = False
+    ) -> RunnableConfig:
+        """Build the run config, attaching a cached plan template for the request if any.
+        
+        `speculative` collects the speculative team runs parked during this
+        run, keyed by the id of the message they answer.
+        """
+        if recursion_limit is None:
+            recursion_limit = self.config.recursion_limit
+        return {
+            "recursion_limit": recursion_limit,
+            "configurable": {
+                "plan_template": self.plan_cache.get(user_input),
+                "stream_tokens": stream_tokens,
+                "speculative": {},
+            },
+        }
+    
+    @staticmethod
+    def _cancel_speculative(config: RunnableConfig):
+        """Cancel the speculative runs a finished or abandoned run left parked."""
+        parked = config["configurable"]["speculative"]
+        for task in parked.values():
+            task.cancel()
+        parked.clear()
+    
+    async def _invoke_team(self, team, name: str, messages, config: RunnableConfig):
+        """Invoke a team, forwarding its LLM token chunks to the custom stream if requested."""
+        if not config.get("configurable", {}).get("stream_tokens"):
+            return await team.ainvoke(messages)
+        
+        writer = get_stream_writer()
+        root_id, output = None, None
+        chat_runs = set()
+        async for event in team.graph.astream_events({"messages": messages}, version="v2"):
+            if root_id is None:
+                root_id = event["run_id"]
+            if event["event"] == "on_chat_model_start":
+                chat_runs.add(event["run_id"])
+            elif event["event"] == "on_chat_model_end":
+                chat_runs.discard(event["run_id"])
+            elif event["event"] == "on_chat_model_stream":
+                # A chat model wrapping another reports every chunk at both levels;
+                # forward only the outermost model's so each token is sent once
+                if chat_runs.intersection(event.get("parent_ids", ())):
+                    continue
+                content = event["data"]["chunk"].content
+                if content:
+                    writer({"team": name, "token": content})
+            elif event["event"] == "on_chain_end" and event["run_id"] == root_id:
+                output = event["data"]["output"]
+        return output
+    
+    async def _call_research_team(
+        self, state: State, config: RunnableConfig
+    ) -> Command[Literal["supervisor"]]:
         """Delegate tasks to the research team and return results to super supervisor."""
-        response = self.research_team.invoke(state["messages"][-1:])
+        parked = config.get("configurable", {}).get("speculative") or {}
+        speculative = parked.pop(state["messages"][-1].id, None)
+        if speculative is not None:
+            response = await speculative
+        else:
+            response = await self._invoke_team(
+                self.research_team, "research_team", state["messages"][-1:], config
+            )
         return Command(
             update={
                 "messages": [
@@ -74,9 +359,13 @@ class HierarchicalSystem:
             goto="supervisor",
         )
     
-    def _call_writer_team(self, state: State) -> Command[Literal["supervisor"]]:
+    async def _call_writer_team(
+        self, state: State, config: RunnableConfig
+    ) -> Command[Literal["supervisor"]]:
         """Delegate tasks to the writing team and return results to super supervisor."""
-        response = self.writing_team.invoke(state["messages"][-1:])
+        response = await self._invoke_team(
+            self.writing_team, "writer_team", state["messages"][-1:], config
+        )
         return Command(
             update={
                 "messages": [
@@ -86,23 +375,66 @@ class HierarchicalSystem:
             goto="supervisor",
         )
     
-    def run(self, user_input: str, recursion_limit: int = None):
-        """Run the hierarchical system with user input."""
-        if recursion_limit is None:
-            recursion_limit = self.config.recursion_limit
+    async def run(self, user_input: str, recursion_limit: int = None, stream_tokens: bool = False):
+        """Run the hierarchical system with user input, yielding an async stream of steps.
         
-        return self.graph.stream(
-            {"messages": [("user", user_input)]},
-            {"recursion_limit": recursion_limit}
-        )
+        With `stream_tokens`, steps are `(mode, chunk)` pairs interleaving graph
+        updates with `{"team", "token"}` chunks streamed from the teams' LLMs.
+        """
+        config = self._run_config(user_input, recursion_limit, stream_tokens)
+        
+        trajectory = []
+        try:
+            async for step in self.graph.astream(
+                {"messages": [("user", user_input)]},
+                config,
+                stream_mode=["updates", "custom"] if stream_tokens else "updates",
+            ):
+                mode, update = step if stream_tokens else ("updates", step)
+                if mode == "updates" and "supervisor" in update:
+                    trajectory.append(update["supervisor"]["next"])
+                yield step
+        finally:
+            # Also reached when the consumer stops iterating or the run fails
+            self._cancel_speculative(config)
+        
+        if trajectory[-1:] == [END]:
+            self._record(user_input, trajectory, config)
+    
+    def _record(self, user_input: str, trajectory: List[str], config: RunnableConfig):
+        """Learn from the routing sequence of a completed run."""
+        self.predictor.observe(trajectory)
+        if config["configurable"]["plan_template"] is None:
+            self.plan_cache.put(user_input, trajectory)
+    
+    async def aclose(self):
+        """Close this system's tools and release its shared components.
+        
+        The HTTP clients are shared with every open system built from the same
+        settings, so they are only closed when the last of those is closed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.tools_manager.close()
+        shared = _release_components(self._settings)
+        if shared is not None:
+            shared.research_team.tools_manager.close()
+            shared.http_client.close()
+            await shared.http_async_client.aclose()
     
     def run_sync(self, user_input: str, recursion_limit: int = None):
         """Run the hierarchical system synchronously and return final result."""
-        if recursion_limit is None:
-            recursion_limit = self.config.recursion_limit
+        config = self._run_config(user_input, recursion_limit)
         
-        result = self.graph.invoke(
-            {"messages": [("user", user_input)]},
-            {"recursion_limit": recursion_limit}
-        )
+        result = run_sync(self._ainvoke(user_input, config))
+        
+        self._record(user_input, self._trajectory(result["messages"]) + [END], config)
         return result
+    
+    async def _ainvoke(self, user_input: str, config: RunnableConfig):
+        """Invoke the graph, cancelling leftover speculative runs on the same loop."""
+        try:
+            return await self.graph.ainvoke({"messages": [("user", user_input)]}, config)
+        finally:
+            self._cancel_speculative(config)
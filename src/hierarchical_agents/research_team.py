@@ -2,13 +2,17 @@
 Research team implementation for web search and content scraping.
 """
 
-from typing import Literal
+from typing import Literal, Optional
 from langchain_core.messages import HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, START
+from langgraph.cache.base import BaseCache
 from langgraph.types import Command
 
+from .cache import last_message_cache_policy
+from .event_loop import run_sync
 from .supervisor import State, SupervisorFramework
 from .tools import ToolsManager
 
@@ -16,10 +20,24 @@ from .tools import ToolsManager
 class ResearchTeam:
     """Research team that coordinates search and web scraping agents."""
     
-    def __init__(self, llm: BaseChatModel, tools_manager: ToolsManager):
-        """Initialize the research team with agents and supervisor."""
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        tools_manager: ToolsManager,
+        cache: Optional[BaseCache] = None,
+        cache_ttl: Optional[int] = 3600,
+        router_llm: Optional[BaseChatModel] = None,
+    ):
+        """Initialize the research team with agents and supervisor.
+        
+        When `cache` is given, search and scraping results are memoized per
+        input message for `cache_ttl` seconds. The supervisor routes with
+        `router_llm` when given, otherwise with `llm`.
+        """
         self.llm = llm
         self.tools_manager = tools_manager
+        self.cache = cache
+        self.cache_ttl = cache_ttl
         
         # Create individual agents
         self.search_agent = create_react_agent(llm, tools=[tools_manager.tavily])
@@ -27,7 +45,7 @@ class ResearchTeam:
         
         # Create supervisor
         self.supervisor_node = SupervisorFramework.make_supervisor_node(
-            llm, ["search", "web_scraper"]
+            router_llm or llm, ["search", "web_scraper"]
         )
         
         # Build the graph
@@ -35,17 +53,18 @@ class ResearchTeam:
     
     def _build_graph(self):
         """Build the research team workflow graph."""
+        cache_policy = last_message_cache_policy(self.cache_ttl)
         builder = StateGraph(State)
         builder.add_node("supervisor", self.supervisor_node)
-        builder.add_node("search", self._search_node)
-        builder.add_node("web_scraper", self._web_scraper_node)
+        builder.add_node("search", self._search_node, cache_policy=cache_policy)
+        builder.add_node("web_scraper", self._web_scraper_node, cache_policy=cache_policy)
         
         builder.add_edge(START, "supervisor")
-        return builder.compile()
+        return builder.compile(cache=self.cache)
     
-    def _search_node(self, state: State) -> Command[Literal["supervisor"]]:
+    async def _search_node(self, state: State) -> Command[Literal["supervisor"]]:
         """Node for handling web search requests."""
-        result = self.search_agent.invoke(state)
+        result = await self.search_agent.ainvoke(state)
         return Command(
             update={
                 "messages": [
@@ -55,9 +74,9 @@ class ResearchTeam:
             goto="supervisor",
         )
     
-    def _web_scraper_node(self, state: State) -> Command[Literal["supervisor"]]:
+    async def _web_scraper_node(self, state: State) -> Command[Literal["supervisor"]]:
         """Node for handling web scraping requests."""
-        result = self.web_scraper_agent.invoke(state)
+        result = await self.web_scraper_agent.ainvoke(state)
         return Command(
             update={
                 "messages": [
@@ -69,4 +88,8 @@ class ResearchTeam:
     
     def invoke(self, messages):
         """Invoke the research team with given messages."""
-        return self.graph.invoke({"messages": messages})
+        return run_sync(self.ainvoke(messages))
+    
+    async def ainvoke(self, messages, config: Optional[RunnableConfig] = None):
+        """Asynchronously invoke the research team with given messages."""
+        return await self.graph.ainvoke({"messages": messages}, config)
@@ -0,0 +1,170 @@
+"""
+Sandboxed Python execution in a pre-warmed worker process.
+
+The worker runs this module with `python -m`, so it never re-imports the
+caller's `__main__` the way multiprocessing's spawn start method does.
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import pickle
+import re
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Optional
+
+# Modules imported once per worker so chart generation doesn't pay for them per call
+PRELOADED_MODULES = ("numpy", "pandas", "matplotlib.pyplot")
+
+# Errors signalling that the worker died or its channel was corrupted
+_CHANNEL_ERRORS = (EOFError, OSError, pickle.UnpicklingError)
+
+# Worker namespace, persisted across executions like a REPL session
+_namespace = {}
+
+
+def _init_worker(memory_limit: int) -> None:
+    """Apply resource limits and pre-import heavy modules in a new worker process."""
+    try:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    for module in PRELOADED_MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+
+def sanitize_input(code: str) -> str:
+    """Strip surrounding whitespace, backticks and a leading `python` tag, as PythonREPL does."""
+    code = re.sub(r"^(\s|`)*(?i:python)?\s*", "", code)
+    code = re.sub(r"(\s|`)*$", "", code)
+    return code
+
+
+def _run_code(code: str) -> str:
+    """Execute code in the worker namespace and return its captured stdout."""
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            exec(sanitize_input(code), _namespace)
+    except Exception as e:
+        return repr(e)
+    return output.getvalue()
+
+
+def _serve(memory_limit: int) -> None:
+    """Worker loop: read pickled code from stdin, reply with pickled output on stdout."""
+    # Move the channel off fds 0 and 1 so executed code can't read from or write into it
+    requests = os.fdopen(os.dup(0), "rb")
+    replies = os.fdopen(os.dup(1), "wb")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+
+    _init_worker(memory_limit)
+    pickle.dump(None, replies)
+    replies.flush()
+
+    while True:
+        try:
+            code = pickle.load(requests)
+        except EOFError:
+            return
+        pickle.dump(_run_code(code), replies)
+        replies.flush()
+
+
+class PythonSandbox:
+    """Runs Python code in an isolated, memory-limited worker process with a timeout.
+
+    The worker starts on the first `run`, and is restarted on the next run
+    after a timeout or crash, losing the variables defined so far.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        memory_limit: int = 4 * 1024 ** 3,
+        startup_timeout: float = 60.0,
+    ):
+        """Initialize the sandbox settings; no worker is started yet."""
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.startup_timeout = startup_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        # Reads replies off the calling thread so they can be waited on with a timeout
+        self._reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sandbox-reader")
+
+    def _start(self) -> bool:
+        """Start a worker and wait until its modules are imported; return whether it came up."""
+        env = dict(os.environ)
+        env.setdefault("MPLBACKEND", "Agg")
+        env.setdefault("OPENBLAS_NUM_THREADS", "1")
+        # Make the package importable under the same name it was imported here
+        root = str(Path(__file__).resolve().parents[__name__.count(".")])
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", __name__, str(self.memory_limit)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+        try:
+            self._receive(self.startup_timeout)
+        except (FutureTimeoutError,) + _CHANNEL_ERRORS:
+            self._kill()
+            return False
+        return True
+
+    def _receive(self, timeout: float):
+        """Wait for the worker's next reply."""
+        return self._reader.submit(pickle.load, self._process.stdout).result(timeout=timeout)
+
+    def _kill(self) -> None:
+        """Kill the worker, e.g. one stuck on runaway code."""
+        process, self._process = self._process, None
+        process.kill()
+        process.wait()
+        process.stdin.close()
+        process.stdout.close()
+
+    def run(self, code: str) -> str:
+        """Execute code in the worker and return its output or error."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                if self._process is not None:
+                    self._kill()
+                if not self._start():
+                    return "RuntimeError: sandbox worker failed to start"
+            try:
+                pickle.dump(code, self._process.stdin)
+                self._process.stdin.flush()
+                return self._receive(self.timeout)
+            except FutureTimeoutError:
+                self._kill()
+                return f"TimeoutError: execution exceeded {self.timeout} seconds"
+            except _CHANNEL_ERRORS:
+                self._kill()
+                return "RuntimeError: worker process crashed while executing the code"
+
+    def close(self) -> None:
+        """Stop the worker, if one was started."""
+        with self._lock:
+            if self._process is not None:
+                self._kill()
+        self._reader.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    _serve(int(sys.argv[1]))
@@ -0,0 +1,33 @@
+"""
+Next-worker prediction for speculatively dispatching teams ahead of the supervisor.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+from langgraph.graph import START
+
+
+class BigramPredictor:
+    """Predicts the supervisor's next routing decision from bigram counts of past runs."""
+
+    def __init__(self, min_count: int = 2, min_confidence: float = 0.6):
+        """Initialize the predictor with the evidence required before predicting."""
+        self.min_count = min_count
+        self.min_confidence = min_confidence
+        self._counts: Dict[str, Counter] = defaultdict(Counter)
+
+    def observe(self, trajectory: List[str]) -> None:
+        """Record the routing decisions of a completed run."""
+        for previous, following in zip([START] + trajectory, trajectory):
+            self._counts[previous][following] += 1
+
+    def predict(self, previous: str) -> Optional[str]:
+        """Return the most likely decision after `previous`, if it is frequent enough."""
+        counts = self._counts.get(previous)
+        if not counts:
+            return None
+        goto, count = counts.most_common(1)[0]
+        if count >= self.min_count and count / sum(counts.values()) >= self.min_confidence:
+            return goto
+        return None
@@ -2,59 +2,137 @@
 Supervisor framework for coordinating multiple agents.
 """
 
-from typing import List, Any
+import operator
+from typing import Annotated, Any, Callable, Dict, List, Literal, Optional
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import SystemMessage
 from langgraph.graph import MessagesState, END
-from langgraph.types import Command
+from langgraph.types import Command, Send
+
+from .cache import RoutingCache, extend_prefix_hashes
+
+
+# Kept byte-identical across calls so the provider can reuse the cached prompt prefix
+SUPERVISOR_PROMPT = (
+    "You are a supervisor tasked with managing a conversation between the"
+    " following workers: {members}. Given the following user request,"
+    " respond with the worker to act next. Each worker will perform a"
+    " task and respond with their results and status. When finished,"
+    " respond with FINISH."
+)
+
+PARALLEL_PROMPT = (
+    " Respond with {group} to run {workers} at the same time when their"
+    " tasks do not depend on each other's results."
+)
 
 
 class State(MessagesState):
-    """State class for agent communication."""
+    """State class for agent communication.
+    
+    `prefix_hashes[i]` is a rolling hash of `messages[:i + 1]`, kept in step by
+    the supervisor so the whole conversation can be used as a cache key in O(1).
+    """
     next: str
+    prefix_hashes: Annotated[List[bytes], operator.add]
 
 
 class SupervisorFramework:
     """Framework for creating supervisor nodes that coordinate multiple agents."""
     
     @staticmethod
-    def make_supervisor_node(llm: BaseChatModel, members: List[str]):
-        """Create a supervisor node that routes between worker agents."""
-        options = ["FINISH"] + members
-        system_prompt = (
-            "You are a supervisor tasked with managing a conversation between the"
-            f" following workers: {members}. Given the following user request,"
-            " respond with the worker to act next. Each worker will perform a"
-            " task and respond with their results and status. When finished,"
-            " respond with FINISH."
+    def make_supervisor_node(
+        llm: BaseChatModel,
+        members: List[str],
+        cache: Optional[RoutingCache] = None,
+        max_history: Optional[int] = None,
+        fast_router: Optional[Callable[[State], Optional[str]]] = None,
+        parallel_groups: Optional[Dict[str, List[str]]] = None,
+    ):
+        """Create a supervisor node that routes between worker agents.
+        
+        Routing decisions are memoized in `cache`, keyed on the conversation's
+        prefix hash, so repeated states skip the LLM call. When
+        `max_history` is set, only the original request and at most
+        `max_history` recent messages follow the fixed system prompt; older
+        messages are dropped in chunks of half that size. `fast_router`
+        may return a worker name or FINISH for states whose next step is
+        unambiguous, or None to fall through to the LLM. Each name in
+        `parallel_groups` is an extra option that fans out to all of its
+        workers at once; they report back together before the next routing step.
+        """
+        if cache is None:
+            cache = RoutingCache()
+        parallel_groups = parallel_groups or {}
+        options = ["FINISH"] + members + list(parallel_groups)
+        system_message = SystemMessage(
+            content=SUPERVISOR_PROMPT.format(members=members) + "".join(
+                PARALLEL_PROMPT.format(group=group, workers=workers)
+                for group, workers in parallel_groups.items()
+            )
         )
         
-        # Create a dynamic router class
+        # Create a dynamic router class constrained to the valid options
         from pydantic import BaseModel, Field
-        from typing import Union
         
         class Router(BaseModel):
             """Worker to route to next, If no worker is needed, return FINISH."""
-            next: str = Field(description=f"Next worker to route to. Options: {options}")
+            next: Literal[tuple(options)] = Field(
+                description=f"Next worker to route to. Options: {options}"
+            )
+        
+        # Bind the structured-output schema once rather than on every routing call
+        router_llm = llm.with_structured_output(Router)
 
-        def supervisor_node(state: State) -> Command[Any]:
+        def route(state: State, goto: str, new_hashes: List[bytes]) -> Command[Any]:
+            """Turn a routing option into a command, fanning out parallel groups."""
+            update = {"next": goto, "prefix_hashes": new_hashes}
+            if goto in parallel_groups:
+                return Command(
+                    goto=[Send(worker, state) for worker in parallel_groups[goto]],
+                    update=update,
+                )
+            if goto == "FINISH":
+                goto = END
+                update["next"] = END
+            return Command(goto=goto, update=update)
+
+        async def supervisor_node(state: State) -> Command[Any]:
             """An LLM-powered supervisor that routes to the next worker or ends the process."""
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ] + state["messages"]
-            response = llm.with_structured_output(Router).invoke(messages)
+            hashes = state.get("prefix_hashes", [])
+            new_hashes = extend_prefix_hashes(hashes, state["messages"])
+            key = (new_hashes or hashes or [b""])[-1]
+            goto = fast_router(state) if fast_router else None
+            if goto is None:
+                goto = cache.get(key)
+            if goto is not None:
+                return route(state, goto, new_hashes)
+            
+            # Trim older messages in fixed-size steps so the window start, and
+            # with it the cacheable prefix, only moves every `step` messages
+            history = state["messages"]
+            excess = len(history) - 1 - max_history if max_history else 0
+            if excess > 0:
+                step = max(max_history // 2, 1)
+                start = 1 + -(-excess // step) * step
+                history = history[:1] + history[start:]
+            messages = [system_message] + history
+            response = await router_llm.ainvoke(messages)
             
             # Handle both dict and object response formats
             try:
                 if isinstance(response, dict):
-                    goto = response.get('next', "FINISH")
+                    goto = response.get('next')
                 else:
                     # Try to access as attribute (for Pydantic models)
-                    goto = getattr(response, 'next', "FINISH")
+                    goto = getattr(response, 'next', None)
             except Exception:
-                goto = "FINISH"
-                
-            if goto == "FINISH":
-                goto = END
-            return Command(goto=goto, update={"next": goto})
+                goto = None
+
+            # Only memoize decisions the router actually made; fallbacks aren't cached
+            if goto not in options:
+                return route(state, "FINISH", new_hashes)
+            cache.put(key, goto)
+            return route(state, goto, new_hashes)
         
         return supervisor_node
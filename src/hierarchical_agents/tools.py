@@ -2,29 +2,59 @@
 Core tools and utilities for the Hierarchical Agents system.
 """
 
+import io
+import logging
 from typing import Annotated, List, Dict, Optional
-from pathlib import Path
-from tempfile import TemporaryDirectory
+from pathlib import PurePosixPath
 
-from langchain_community.document_loaders import WebBaseLoader
+from cachetools import TTLCache
 from langchain_tavily import TavilySearch
 from langchain_core.tools import tool
-from langchain_experimental.utilities import PythonREPL
+
+from .sandbox import PythonSandbox
+
+logger = logging.getLogger(__name__)
+
+
+def _readlines(text: str) -> List[str]:
+    """Split text into lines exactly as reading it from a text-mode file would."""
+    return io.StringIO(text, newline=None).readlines()
 
 
 class ToolsManager:
     """Manager class for all tools used by the agent system."""
     
-    def __init__(self, tavily_api_key: str):
-        """Initialize tools with required API keys."""
+    def __init__(self, tavily_api_key: str, scrape_cache_size: int = 256, scrape_cache_ttl: int = 3600):
+        """Initialize tools with required API keys and the per-URL scraped-page cache settings."""
         self.tavily = TavilySearch(max_results=3, api_key=tavily_api_key)
-        self._temp_dir = TemporaryDirectory()
-        self.working_dir = Path(self._temp_dir.name)
-        self.repl = PythonREPL()
+        # Documents live in memory under a virtual working directory
+        self.working_dir = PurePosixPath("/workspace")
+        self.files: Dict[str, str] = {}
+        self.repl = PythonSandbox()
+        self.scrape_cache = TTLCache(maxsize=scrape_cache_size, ttl=scrape_cache_ttl)
+        self.scrap_web = self._create_scrap_web_tool()
+        
+    def close(self):
+        """Shut down the Python sandbox."""
+        self.repl.close()
+    
+    def _resolve(self, file_name: str) -> str:
+        """Map a file name or a path under the working directory to its document key."""
+        path = PurePosixPath(file_name)
+        if path.is_relative_to(self.working_dir):
+            path = path.relative_to(self.working_dir)
+        return str(path)
+    
+    def _read(self, file_name: str) -> str:
+        """Return the content of a stored document."""
+        try:
+            return self.files[self._resolve(file_name)]
+        except KeyError:
+            raise FileNotFoundError(f"No such file or directory: '{self.working_dir / file_name}'")
         
     def get_research_tools(self):
         """Get tools for research team."""
-        return [self.tavily, self._create_scrap_web_tool()]
+        return [self.tavily, self.scrap_web]
     
     def get_writing_tools(self):
         """Get tools for writing team."""
@@ -40,19 +70,41 @@ class ToolsManager:
 
     def _create_scrap_web_tool(self):
         """Create scrap_web tool."""
+        cache = self.scrape_cache
+        
         @tool
-        def scrap_web(urls: List[str]) -> str:
+        async def scrap_web(urls: List[str]) -> str:
             """Scrape the content of a webpage given its URL."""
-            loader = WebBaseLoader(urls)
-            docs = loader.load()
-            return "\n\n".join(
-                [f"Document name: {doc.metadata.get('title', '')}\n{doc.page_content}" for doc in docs]
-            )
+            urls = list(dict.fromkeys(urls))
+            pages = {url: cache.get(url) for url in urls}
+            pages = {url: page for url, page in pages.items() if page is not None}
+            if pages:
+                logger.info(
+                    "scrap_web cache hit for %d URL(s), ~%d tokens not re-fetched",
+                    len(pages), sum(len(page) for page in pages.values()) // 4,
+                )
+            
+            missing = [url for url in urls if url not in pages]
+            if missing:
+                # Deferred so runs that never scrape skip langchain_community's loaders
+                from langchain_community.document_loaders import WebBaseLoader
+                
+                loader = WebBaseLoader(missing, requests_per_second=10, continue_on_failure=True)
+                docs = [doc async for doc in loader.alazy_load()]
+                for url, doc in zip(missing, docs):
+                    pages[url] = f"Document name: {doc.metadata.get('title', '')}\n{doc.page_content}"
+                    # Failed fetches come back empty; leave them out so they are retried
+                    if doc.page_content.strip():
+                        cache[url] = pages[url]
+            
+            return "\n\n".join(pages[url] for url in urls if url in pages)
         return scrap_web
 
     def _create_outline_tool(self):
         """Create outline tool."""
         working_dir = self.working_dir
+        files = self.files
+        resolve = self._resolve
         
         @tool
         def create_outline(
@@ -60,15 +112,15 @@ class ToolsManager:
             file_name: Annotated[str, "The name of the file to save the outline"],
         ) -> Annotated[str, "The file path where the outline is saved"]:
             """Create a text file with the given outline points."""
-            with (working_dir / file_name).open("w") as f:
-                for i, point in enumerate(points):
-                    f.write(f"{i + 1}. {point}\n")
+            files[resolve(file_name)] = "".join(
+                f"{i + 1}. {point}\n" for i, point in enumerate(points)
+            )
             return f"Outline saved to {working_dir / file_name}"
         return create_outline
 
     def _create_read_document_tool(self):
         """Create read document tool."""
-        working_dir = self.working_dir
+        read = self._read
         
         @tool
         def read_document(
@@ -77,16 +129,16 @@ class ToolsManager:
             end: Annotated[Optional[int], "The end line. Default is None"] = None,
         ) -> str:
             """Read the specified document."""
-            with (working_dir / file_name).open("r") as file:
-                lines = file.readlines()
             if start is None:
                 start = 0
-            return "\n".join(lines[start:end])
+            lines = _readlines(read(file_name))
+            return "".join(lines[start:end])
         return read_document
 
     def _create_write_document_tool(self):
         """Create write document tool."""
-        working_dir = self.working_dir
+        files = self.files
+        resolve = self._resolve
         
         @tool
         def write_document(
@@ -94,14 +146,15 @@ class ToolsManager:
             file_name: Annotated[str, "File path to save the document."],
         ) -> Annotated[str, "Path of the saved document file."]:
             """Create and save a text document."""
-            with (working_dir / file_name).open("w") as file:
-                file.write(content)
+            files[resolve(file_name)] = content
             return f"Document saved to {file_name}"
         return write_document
 
     def _create_edit_document_tool(self):
         """Create edit document tool."""
-        working_dir = self.working_dir
+        files = self.files
+        resolve = self._resolve
+        read = self._read
         
         @tool
         def edit_document(
@@ -112,19 +165,26 @@ class ToolsManager:
             ],
         ) -> Annotated[str, "Path of the edited document file."]:
             """Edit a document by inserting text at specific line numbers."""
-            with (working_dir / file_name).open("r") as file:
-                lines = file.readlines()
+            lines = _readlines(read(file_name))
 
             sorted_inserts = sorted(inserts.items())
 
-            for line_number, text in sorted_inserts:
-                if 1 <= line_number <= len(lines) + 1:
-                    lines.insert(line_number - 1, text + "\n")
-                else:
+            # Line numbers count earlier inserts, so the n-th insert lands n lines
+            # further into the original document than its number suggests
+            for offset, (line_number, _) in enumerate(sorted_inserts):
+                if not 1 <= line_number <= len(lines) + offset + 1:
                     return f"Error: Line number {line_number} is out of range."
 
-            with (working_dir / file_name).open("w") as file:
-                file.writelines(lines)
+            edited = []
+            current = 0
+            for offset, (line_number, text) in enumerate(sorted_inserts):
+                index = line_number - 1 - offset
+                edited.extend(lines[current:index])
+                edited.append(text + "\n")
+                current = index
+            edited.extend(lines[current:])
+
+            files[resolve(file_name)] = "".join(edited)
 
             return f"Document edited and saved to {file_name}"
         return edit_document
@@ -135,7 +195,7 @@ class ToolsManager:
         
         @tool
         def python_repl_tool(code: Annotated[str, "Python code to execute"]) -> str:
-            """Execute Python code in a REPL environment."""
+            """Execute Python code in a sandboxed REPL environment."""
             try:
                 results = repl.run(code)
             except BaseException as e:
@@ -2,13 +2,14 @@
 Writing team implementation for document creation and editing.
 """
 
-from typing import Literal
+from typing import Literal, Optional
 from langchain_core.messages import HumanMessage
 from langchain_core.language_models.chat_models import BaseChatModel
 from langgraph.prebuilt import create_react_agent
 from langgraph.graph import StateGraph, START
 from langgraph.types import Command
 
+from .event_loop import run_sync
 from .supervisor import State, SupervisorFramework
 from .tools import ToolsManager
 
@@ -16,8 +17,16 @@ from .tools import ToolsManager
 class WritingTeam:
     """Writing team that coordinates document writing, note-taking, and chart generation."""
     
-    def __init__(self, llm: BaseChatModel, tools_manager: ToolsManager):
-        """Initialize the writing team with agents and supervisor."""
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        tools_manager: ToolsManager,
+        router_llm: Optional[BaseChatModel] = None,
+    ):
+        """Initialize the writing team with agents and supervisor.
+        
+        The supervisor routes with `router_llm` when given, otherwise with `llm`.
+        """
         self.llm = llm
         self.tools_manager = tools_manager
         
@@ -45,9 +54,12 @@ class WritingTeam:
             tools=tools_manager.get_chart_tools()
         )
         
-        # Create supervisor
+        # Create supervisor; note_taker and chart_generator can also be run
+        # side by side when the chart doesn't depend on the outline
         self.supervisor_node = SupervisorFramework.make_supervisor_node(
-            llm, ["doc_writer", "note_taker", "chart_generator"]
+            router_llm or llm,
+            ["doc_writer", "note_taker", "chart_generator"],
+            parallel_groups={"notes_and_chart": ["note_taker", "chart_generator"]},
         )
         
         # Build the graph
@@ -104,7 +116,11 @@ class WritingTeam:
     
     def invoke(self, messages):
         """Invoke the writing team with given messages."""
+        return run_sync(self.ainvoke(messages))
+    
+    async def ainvoke(self, messages):
+        """Asynchronously invoke the writing team with given messages."""
         if isinstance(messages, list):
-            return self.graph.invoke({"messages": messages})
+            return await self.graph.ainvoke({"messages": messages})
         else:
-            return self.graph.invoke(messages)
+            return await self.graph.ainvoke(messages)